@@ -1,16 +1,27 @@
 import runpod
 import requests
+import functools
 import json
+import logging
+import random
 import time
 import os
 from typing import Dict, Any, List, Optional, Set
 import uuid
 from pathlib import Path
+from urllib.parse import urlencode
 import base64
 import re
 import tempfile
 import subprocess
 
+# orjson round-trips JSON-shaped dicts in C, much faster than the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import S3 upload functionality
 try:
     from s3_upload import is_s3_configured, upload_file_to_s3, upload_bytes_to_s3
@@ -19,9 +30,28 @@ except ImportError:
     S3_UPLOAD_AVAILABLE = False
     print("Warning: s3_upload module not available. S3 upload will be disabled.")
 
+# NullHandler by default: disabled levels early-out on an integer compare
+# instead of flushing to stdout under the print lock
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
 COMFY_API_URL = os.getenv("COMFY_API_URL", "http://127.0.0.1:8188")
 COMFY_WS_URL = os.getenv("COMFY_WS_URL", COMFY_API_URL.replace("http://", "ws://").replace("https://", "wss://") + "/ws")
 
+# Keep-alive session for all ComfyUI calls: high-frequency polling during
+# wait_for_completion reuses sockets to 127.0.0.1 instead of reconnecting
+from requests.adapters import HTTPAdapter
+
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+# Hot-path endpoints, built once instead of re-interpolated per request
+_VIEW_URL = f"{COMFY_API_URL}/view?"
+_PROMPT_URL = f"{COMFY_API_URL}/prompt"
+_HISTORY_URL = f"{COMFY_API_URL}/history/"
+
 # Network volume support with local fallback
 # In RunPod: /runpod-volume
 # Locally: Set MODELS_PATH environment variable or use ./models
@@ -55,58 +85,113 @@ def apply_overrides(workflow: Dict[str, Any], overrides: List[Dict[str, Any]]) -
         }
     ]
     """
-    workflow_copy = json.loads(json.dumps(workflow))
+    # Copy via a JSON round-trip: workflows are JSON-shaped, so this beats
+    # copy.deepcopy and orjson beats the stdlib codec when installed
+    if ORJSON_AVAILABLE:
+        workflow_copy = orjson.loads(orjson.dumps(workflow))
+    else:
+        workflow_copy = json.loads(json.dumps(workflow))
 
-    for override in overrides:
-        node_id = str(override.get("node_id"))
-        field = override.get("field")
-        value = override.get("value")
+    # Jobs usually replay the same override shape with fresh values, so the
+    # applier is specialized per (node_id, field) signature and cached
+    signature = tuple((str(o.get("node_id")), o.get("field")) for o in overrides)
+    applier = _compile_overrides(signature)
+    return applier(workflow_copy, [o.get("value") for o in overrides])
 
-        if node_id not in workflow_copy:
-            print(f"Warning: Node {node_id} not found in workflow")
-            continue
 
-        # Parse nested field path (e.g., "inputs.seed")
-        field_parts = field.split(".")
-        current = workflow_copy[node_id]
+@functools.lru_cache(maxsize=64)
+def _compile_overrides(signature):
+    """
+    Generate a specialized function applying one override shape.
 
-        # Navigate to the parent of the target field
-        for part in field_parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
+    signature is a tuple of (node_id, field) pairs. The generated function
+    takes (workflow, values) and sets each field as straight-line code —
+    no per-call loop over overrides, no re-splitting of dot paths.
+    """
+    lines = ["def _apply(workflow, values):"]
+    for index, (node_id, field) in enumerate(signature):
+        parts = field.split(".")
+        lines.append(f"    node = workflow.get({node_id!r})")
+        lines.append("    if node is None:")
+        lines.append(f"        _log.warning({f'Node {node_id} not found in workflow'!r})")
+        lines.append("    else:")
+        lines.append("        current = node")
+        for part in parts[:-1]:
+            lines.append(f"        current = current.setdefault({part!r}, {{}})")
+        lines.append(f"        current[{parts[-1]!r}] = values[{index}]")
+        lines.append(
+            f"        _log.info({f'Applied override: Node {node_id}, {field} = %s'!r}, values[{index}])"
+        )
+    lines.append("    return workflow")
+
+    namespace = {"_log": _log}
+    exec("\n".join(lines), namespace)
+    return namespace["_apply"]
+
+
+@functools.lru_cache(maxsize=128)
+def _validate_workflow_structure(workflow_bytes: bytes) -> Optional[str]:
+    """
+    Validate the structural shape of a serialized workflow.
 
-        # Set the final value
-        current[field_parts[-1]] = value
-        print(f"Applied override: Node {node_id}, {field} = {value}")
+    Returns an error message, or None if the workflow looks valid.
 
-    return workflow_copy
+    Keyed by the serialized bytes, so replays of the same workflow (the
+    common case: identical workflow, different overrides) skip the
+    per-node pass entirely.
+    """
+    if ORJSON_AVAILABLE:
+        workflow = orjson.loads(workflow_bytes)
+    else:
+        workflow = json.loads(workflow_bytes)
+
+    if not isinstance(workflow, dict):
+        return "Workflow must be an object mapping node IDs to nodes"
 
+    for node_id, node_data in workflow.items():
+        if not isinstance(node_data, dict):
+            return f"Node {node_id} must be an object"
+        if "class_type" not in node_data:
+            return f"Node {node_id} is missing 'class_type'"
 
-def check_server(max_retries: int = 50, delay: float = 0.05) -> None:
+    return None
+
+
+def check_server(max_retries: int = 50, delay: float = 0.05, max_wait: float = 3.0) -> None:
     """
     Check if ComfyUI server is reachable.
 
     Args:
         max_retries: Maximum number of connection attempts (default: 50)
-        delay: Delay between retries in seconds (default: 0.05)
+        delay: Initial delay between retries in seconds (default: 0.05);
+               doubles per attempt with jitter
+        max_wait: Total sleep budget across all retries in seconds
+                  (default: 3.0)
 
     Raises:
-        Exception: If server is not reachable after all retries
+        Exception: If server is not reachable within the retry/time budget
     """
+    attempt = 0
+    waited = 0.0
     for attempt in range(max_retries):
         try:
-            response = requests.get(f"{COMFY_API_URL}/system_stats", timeout=2)
+            response = _SESSION.get(f"{COMFY_API_URL}/system_stats", timeout=2)
             if response.status_code == 200:
                 print(f"ComfyUI server is reachable (attempt {attempt + 1})")
                 return
         except requests.RequestException:
             pass
 
-        if attempt < max_retries - 1:
-            time.sleep(delay)
+        if attempt == max_retries - 1 or waited >= max_wait:
+            break
+        # Exponential backoff with jitter, bounded by a cumulative budget
+        # so a dead server fails in seconds (handler() probes this per
+        # job) instead of sleeping out the full retry schedule
+        step = min(delay * (2 ** attempt), max_wait - waited) + random.uniform(0, 0.1)
+        time.sleep(step)
+        waited += step
 
-    raise Exception(f"ComfyUI server at {COMFY_API_URL} is not reachable after {max_retries} attempts")
+    raise Exception(f"ComfyUI server at {COMFY_API_URL} is not reachable after {attempt + 1} attempts")
 
 
 def decode_base64_image(image_data: str) -> bytes:
@@ -164,7 +249,7 @@ def upload_image(filename: str, image_bytes: bytes, overwrite: bool = True) -> D
     files = {'image': (filename, image_bytes, content_type)}
     data = {'overwrite': 'true' if overwrite else 'false'}
 
-    response = requests.post(f"{COMFY_API_URL}/upload/image", files=files, data=data)
+    response = _SESSION.post(f"{COMFY_API_URL}/upload/image", files=files, data=data)
     response.raise_for_status()
 
     return response.json()
@@ -239,7 +324,7 @@ def queue_prompt(workflow: Dict[str, Any], client_id: str, comfyorg_api_key: Opt
         }
         print("Comfy.org API key injected into workflow")
 
-    response = requests.post(f"{COMFY_API_URL}/prompt", json=payload)
+    response = _SESSION.post(_PROMPT_URL, json=payload)
     response.raise_for_status()
 
     result = response.json()
@@ -253,7 +338,7 @@ def queue_prompt(workflow: Dict[str, Any], client_id: str, comfyorg_api_key: Opt
 
 def get_history(prompt_id: str) -> Optional[Dict[str, Any]]:
     """Get the history/results for a prompt ID."""
-    response = requests.get(f"{COMFY_API_URL}/history/{prompt_id}")
+    response = _SESSION.get(_HISTORY_URL + prompt_id)
     response.raise_for_status()
 
     history = response.json()
@@ -308,26 +393,27 @@ def get_output_images(history: Dict[str, Any]) -> List[Dict[str, str]]:
     Returns:
         List of dicts with 'filename', 'subfolder', 'type' for each output image
     """
-    images = []
-
     outputs = history.get("outputs", {})
-    for node_id, node_output in outputs.items():
-        if "images" in node_output:
-            for image_info in node_output["images"]:
-                images.append({
-                    "filename": image_info.get("filename"),
-                    "subfolder": image_info.get("subfolder", ""),
-                    "type": image_info.get("type", "output"),
-                    "node_id": node_id
-                })
-
-    return images
+    return [
+        {
+            "filename": image_info.get("filename"),
+            "subfolder": image_info.get("subfolder", ""),
+            "type": image_info.get("type", "output"),
+            "node_id": node_id
+        }
+        for node_id, node_output in outputs.items()
+        for image_info in node_output.get("images", ())
+    ]
 
 
 def get_image_url(filename: str, subfolder: str = "", folder_type: str = "output") -> str:
     """Generate the URL to download an image from ComfyUI."""
-    params = f"filename={filename}&subfolder={subfolder}&type={folder_type}"
-    return f"{COMFY_API_URL}/view?{params}"
+    # urlencode handles spaces/unicode in filenames correctly in one call
+    params = {"filename": filename}
+    if subfolder:
+        params["subfolder"] = subfolder
+    params["type"] = folder_type
+    return _VIEW_URL + urlencode(params)
 
 
 def download_image_from_comfy(filename: str, subfolder: str = "", folder_type: str = "output") -> bytes:
@@ -346,7 +432,7 @@ def download_image_from_comfy(filename: str, subfolder: str = "", folder_type: s
         requests.RequestException: If download fails
     """
     url = get_image_url(filename, subfolder, folder_type)
-    response = requests.get(url)
+    response = _SESSION.get(url)
     response.raise_for_status()
     return response.content
 
@@ -451,7 +537,7 @@ def health_check(event: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         # Try to reach ComfyUI's /system_stats endpoint (or any basic endpoint)
-        response = requests.get(f"{COMFY_API_URL}/system_stats", timeout=5)
+        response = _SESSION.get(f"{COMFY_API_URL}/system_stats", timeout=5)
         comfyui_reachable = response.status_code == 200
     except Exception as e:
         print(f"ComfyUI health check failed: {str(e)}")
@@ -476,7 +562,7 @@ def get_available_models() -> Dict[str, List[str]]:
         }
     """
     try:
-        response = requests.get(f"{COMFY_API_URL}/object_info")
+        response = _SESSION.get(f"{COMFY_API_URL}/object_info")
         response.raise_for_status()
         object_info = response.json()
 
@@ -612,7 +698,12 @@ def wait_for_completion_ws(prompt_id: str, client_id: str, timeout: int = 600) -
                 out = ws.recv()
 
                 if isinstance(out, str):
-                    message = json.loads(out)
+                    # WS status messages arrive at high frequency during
+                    # execution; decode them with orjson when available
+                    if ORJSON_AVAILABLE:
+                        message = orjson.loads(out)
+                    else:
+                        message = json.loads(out)
                     msg_type = message.get("type")
 
                     # Log progress updates
@@ -764,6 +855,25 @@ def handler(event: Dict[str, Any]) -> Dict[str, Any]:
             }
 
         workflow = job_input["workflow"]
+
+        # Structural validation is memoized on the serialized workflow, so
+        # repeat invocations of the same workflow skip the per-node pass
+        try:
+            if ORJSON_AVAILABLE:
+                workflow_bytes = orjson.dumps(workflow)
+            else:
+                workflow_bytes = json.dumps(workflow, sort_keys=True).encode()
+        except (TypeError, ValueError):
+            workflow_bytes = None
+
+        if workflow_bytes is not None:
+            structure_error = _validate_workflow_structure(workflow_bytes)
+            if structure_error:
+                return {
+                    "error": structure_error,
+                    "status": "validation_error"
+                }
+
         overrides = job_input.get("overrides", [])
         return_images = job_input.get("return_images", True)
         timeout = job_input.get("timeout", 600)
@@ -899,7 +1009,7 @@ def ensure_comfyui_ready():
         # Still need to start ComfyUI server even if it exists
         # Check if ComfyUI is already running
         try:
-            response = requests.get(f"{COMFY_API_URL}/system_stats", timeout=2)
+            response = _SESSION.get(f"{COMFY_API_URL}/system_stats", timeout=2)
             if response.status_code == 200:
                 print("✓ ComfyUI server is already running")
                 return
@@ -921,7 +1031,7 @@ def ensure_comfyui_ready():
             max_attempts = 30
             for attempt in range(1, max_attempts + 1):
                 try:
-                    response = requests.get(f"{COMFY_API_URL}/system_stats", timeout=2)
+                    response = _SESSION.get(f"{COMFY_API_URL}/system_stats", timeout=2)
                     if response.status_code == 200:
                         print(f"✓ ComfyUI server started successfully (attempt {attempt})")
                         return
@@ -17,50 +17,111 @@ Options:
 """
 
 import argparse
+import functools
 import os
 import re
+import shlex
+import shutil
 import subprocess
 import sys
+import threading
+import urllib.error
+import urllib.request
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict
-from dataclasses import dataclass
+from typing import List, Tuple, Optional, Dict, Set
+from dataclasses import dataclass, field
+
+from yaml_stream import STREAM_THRESHOLD, stream_parse_section
 
 try:
     import yaml
     YAML_AVAILABLE = True
+    try:
+        # libyaml-backed loader is orders of magnitude faster than pure Python
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+        print("Warning: libyaml not available, falling back to pure-Python YAML parser (slower)")
 except ImportError:
     YAML_AVAILABLE = False
     print("Warning: PyYAML not installed. Install with: pip install pyyaml")
 
 
-@dataclass
+# Extracts repo name from URL, tolerating a trailing slash:
+# https://github.com/user/repo.git -> repo
+_REPO_NAME_RE = re.compile(r'/([^/]+?)(?:\.git)?/?$')
+
+def _url_cache_parts(url: str) -> List[str]:
+    """Path components identifying a repo URL (host, owner, ..., name),
+    with the scheme and .git suffix stripped. Including the owner keeps
+    same-named repos from different owners in separate cache entries."""
+    tail = re.sub(r'^[a-z+]+://', '', url)
+    tail = re.sub(r'\.git/?$', '', tail).rstrip('/')
+    return [part for part in tail.split('/') if part]
+
+
+# Canonical instances of the version strings that repeat across entries,
+# so later equality checks short-circuit on identity
+_COMMON_VERSIONS = {v: sys.intern(v) for v in ('latest', 'nightly', 'main')}
+
+# Matches one requirement line; group(1) is the package name without
+# version specifiers, used as the deduplication key
+_REQ_LINE_RE = re.compile(r'^[ \t]*([^\s#][^\s<>=!~;]*)[^\n]*$', re.M)
+
+
+@dataclass(slots=True)
 class NodeEntry:
     """Represents a custom node to install"""
     url: str
     version: str
     line_number: int
     name: Optional[str] = None  # Extracted from URL
+    repo_name: str = field(init=False)
 
-    @property
-    def repo_name(self) -> str:
-        """Extract repository name from URL"""
+    def __post_init__(self):
+        # Computed eagerly: slots preclude cached_property, and every entry
+        # that gets installed needs the name anyway
         if self.name:
-            return self.name
-        # Extract from URL: https://github.com/user/repo.git -> repo
-        match = re.search(r'/([^/]+?)(?:\.git)?$', self.url)
-        if match:
-            return match.group(1)
-        return "unknown"
+            self.repo_name = self.name
+        else:
+            match = _REPO_NAME_RE.search(self.url)
+            self.repo_name = match.group(1) if match else "unknown"
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_yaml_cached(path_str: str, mtime_ns: int, size: int):
+    """
+    Parse a YAML file, cached by (path, mtime, size).
 
+    Re-parsing the same unchanged config costs one os.stat instead of a
+    full tokenize; any edit changes the stat tuple and invalidates the
+    entry. Parse errors propagate uncached. Large files take the
+    event-streaming path that materializes only the nodes section.
+    """
+    if size > STREAM_THRESHOLD:
+        nodes = stream_parse_section(path_str, 'nodes')
+        if nodes is not None:
+            return {'nodes': nodes}
 
+    with open(path_str, 'rb') as f:
+        return yaml.load(f.read(), Loader=_YamlLoader)
+
+
+@dataclass(slots=True)
 class NodeFileParser:
     """Parses config.yml file"""
 
-    def __init__(self, file_path: Path):
-        self.file_path = file_path
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
+    file_path: Path
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    # Anchored alternation covering latest/nightly, semver, commit hash,
+    # and branch names - one match instead of four per entry
+    VERSION_RE = re.compile(r'^(?:v?\d+\.\d+(?:\.\d+)?.*|[0-9a-f]{7,40}|[a-zA-Z0-9_-]+)$')
+    # Known git hosts or an explicit .git suffix
+    URL_RE = re.compile(r'(github|gitlab|gitea|bitbucket)\.|\.git$')
 
     def parse(self) -> List[NodeEntry]:
         """Parse the config file and return list of node entries"""
@@ -77,8 +138,11 @@ class NodeFileParser:
             return []
 
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            st = os.stat(self.file_path)
+            config = _parse_yaml_cached(str(self.file_path), st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            self.errors.append(f"Config file not found: {self.file_path}")
+            return []
         except yaml.YAMLError as e:
             self.errors.append(f"YAML parsing error: {e}")
             return []
@@ -100,6 +164,7 @@ class NodeFileParser:
 
             url = node.get('url')
             version = node.get('version', 'latest')
+            version = _COMMON_VERSIONS.get(version, version)
 
             if not url:
                 self.warnings.append(f"Node entry {idx} missing 'url', skipping")
@@ -121,34 +186,58 @@ class NodeFileParser:
 
         return entries
 
+    def preflight_urls(self, entries: List[NodeEntry]) -> None:
+        """
+        Concurrently HEAD-check entry URLs so dead links surface in
+        seconds instead of deep inside a 5-minute git clone timeout.
+        404s are recorded as warnings only: GitHub answers 404 for
+        unauthenticated requests to private repos, so the clone (which
+        can use a credential helper) stays the authoritative check.
+        """
+        if not entries:
+            return
+
+        def check(entry: NodeEntry) -> Optional[str]:
+            request = urllib.request.Request(entry.url, method='HEAD')
+            try:
+                urllib.request.urlopen(request, timeout=3)
+            except urllib.error.HTTPError as e:
+                if e.code == 404:
+                    return (
+                        f"Node entry {entry.line_number}: URL answered 404 "
+                        f"(missing or private repo): {entry.url}"
+                    )
+            except Exception:
+                pass
+            return None
+
+        with ThreadPoolExecutor(max_workers=min(64, len(entries))) as executor:
+            for warning in executor.map(check, entries):
+                if warning:
+                    self.warnings.append(warning)
+
     def _validate_url(self, url: str) -> bool:
         """Validate that URL looks like a git repository"""
         # Should contain github/gitlab/gitea or end with .git
-        return bool(
-            re.search(r'(github|gitlab|gitea|bitbucket)\.', url) or
-            url.endswith('.git')
-        )
+        return bool(self.URL_RE.search(url))
 
     def _validate_version(self, version: str) -> bool:
         """Validate version specifier format"""
         # Valid: latest, nightly, v1.2.3, commit hash, branch name
-        if version in ['latest', 'nightly']:
-            return True
-        # Semver pattern
-        if re.match(r'^v?\d+\.\d+(\.\d+)?', version):
-            return True
-        # Commit hash (7-40 hex chars)
-        if re.match(r'^[0-9a-f]{7,40}$', version):
-            return True
-        # Branch name (alphanumeric, dash, underscore)
-        if re.match(r'^[a-zA-Z0-9_-]+$', version):
-            return True
-        return False
+        return bool(self.VERSION_RE.match(version))
 
 
 class NodeInstaller:
     """Installs custom nodes with version control"""
 
+    # Per-user bare mirrors so repeat full clones across runs reuse
+    # locally cached pack data instead of re-downloading
+    # Overridable so CI and container builds can point the bare-repo cache
+    # at a persistent location
+    MIRROR_ROOT = Path(
+        os.environ.get("NODE_CACHE", "~/.cache/comfyui-nodes-mirror")
+    ).expanduser()
+
     def __init__(
         self,
         comfyui_dir: Path,
@@ -164,6 +253,170 @@ class NodeInstaller:
         self.installed = 0
         self.skipped = 0
         self.failed = 0
+        # Guards counter updates and print() from worker threads
+        self._lock = threading.Lock()
+        # Memoizes _check_version results so repeat checks on the same
+        # node_dir don't re-spawn git rev-parse
+        self._version_cache: Dict[Tuple[Path, str], bool] = {}
+        # Memoizes each repo's default branch (resolved from origin/HEAD)
+        self._default_branch_cache: Dict[Path, str] = {}
+        # Snapshot of existing node dirs, so skip checks are one scandir
+        # per run instead of one stat per entry (None until first use)
+        self._existing: Optional[Set[str]] = None
+        # URL -> local reference repo path, for deduplicating clones of
+        # identical URLs across entries (populated in install_all)
+        self._reference_repos: Dict[str, str] = {}
+
+    def _resolve_latest_tags(self, entries: List[NodeEntry]) -> None:
+        """
+        Resolve 'latest' entries to a concrete tag with one ls-remote
+        roundtrip each, so the clone can be shallow instead of fetching
+        full history just to run git describe.
+        """
+        latest_entries = [e for e in entries if e.version == 'latest']
+        if not latest_entries:
+            return
+
+        def resolve(entry: NodeEntry) -> None:
+            try:
+                result = subprocess.run(
+                    ['git', 'ls-remote', '--tags', '--sort=-v:refname', '--refs', entry.url],
+                    capture_output=True,
+                    close_fds=False,
+                    text=True,
+                    timeout=30
+                )
+                if result.returncode == 0 and result.stdout:
+                    # First line is "<sha>\trefs/tags/<newest tag>"
+                    first_line = result.stdout.split('\n', 1)[0]
+                    if '\trefs/tags/' in first_line:
+                        entry.version = first_line.split('refs/tags/', 1)[1]
+            except (subprocess.TimeoutExpired, OSError):
+                pass  # Keep 'latest'; the clone path falls back to git describe
+
+        with ThreadPoolExecutor(max_workers=min(8, len(latest_entries))) as executor:
+            list(executor.map(resolve, latest_entries))
+
+    def _ensure_mirror(self, entry: NodeEntry) -> Optional[str]:
+        """
+        Create or refresh a bare mirror of the entry's repo under MIRROR_ROOT.
+        Returns the mirror path, or None if mirroring failed.
+        """
+        parts = _url_cache_parts(entry.url)
+        if not parts:
+            return None
+        mirror = self.MIRROR_ROOT.joinpath(*parts[:-1], f"{parts[-1]}.git")
+        try:
+            if mirror.exists():
+                subprocess.run(
+                    ['git', '-C', str(mirror), 'remote', 'update', '--prune'],
+                    capture_output=True,
+                    close_fds=False,
+                    timeout=120
+                )
+            else:
+                mirror.parent.mkdir(parents=True, exist_ok=True)
+                result = subprocess.run(
+                    ['git', 'clone', '--mirror', '--quiet', entry.url, str(mirror)],
+                    capture_output=True,
+                    close_fds=False,
+                    text=True,
+                    timeout=300
+                )
+                if result.returncode != 0:
+                    return None
+            return str(mirror)
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+
+    def _prepare_reference_repos(self, entries: List[NodeEntry]) -> None:
+        """
+        Create local bare reference repos for URLs shared by multiple entries,
+        so duplicate URLs are fetched from the network only once.
+        """
+        url_to_entries: Dict[str, List[NodeEntry]] = {}
+        for entry in entries:
+            url_to_entries.setdefault(entry.url, []).append(entry)
+
+        duplicate_urls = {url: ents for url, ents in url_to_entries.items() if len(ents) > 1}
+        if not duplicate_urls:
+            return
+
+        cache_dir = self.custom_nodes_dir / ".cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        for url, ents in duplicate_urls.items():
+            cache_repo = cache_dir / ('__'.join(_url_cache_parts(url)) + '.git')
+            try:
+                if not cache_repo.exists():
+                    result = subprocess.run(
+                        ['git', 'clone', '--mirror', '--filter=blob:none', url, str(cache_repo)],
+                        capture_output=True,
+                        close_fds=False,
+                        text=True,
+                        timeout=300
+                    )
+                    if result.returncode != 0:
+                        continue  # Fall back to plain clones for this URL
+                self._reference_repos[url] = str(cache_repo)
+            except (subprocess.TimeoutExpired, OSError):
+                continue
+
+    def _cleanup_reference_repos(self) -> None:
+        """Remove cached reference repos that no longer back any entry"""
+        cache_dir = self.custom_nodes_dir / ".cache"
+        if not cache_dir.exists():
+            return
+
+        active = {Path(p).name for p in self._reference_repos.values()}
+        for cached in cache_dir.iterdir():
+            if cached.name not in active:
+                shutil.rmtree(cached, ignore_errors=True)
+
+    def _read_version_marker(self, node_dir: Path) -> Optional[str]:
+        """Read the recorded target version from the node's marker file"""
+        try:
+            return (node_dir / '.comfy-node-version').read_text().splitlines()[0]
+        except (OSError, IndexError):
+            return None
+
+    def _write_version_marker(self, entry: NodeEntry, node_dir: Path) -> None:
+        """Record the installed ref so later runs can skip the git preflight"""
+        try:
+            result = subprocess.run(
+                ['git', '-C', str(node_dir), 'rev-parse', 'HEAD'],
+                capture_output=True,
+                close_fds=False,
+                text=True
+            )
+            head = result.stdout.strip() if result.returncode == 0 else ''
+            (node_dir / '.comfy-node-version').write_text(f"{entry.version}\n{head}\n")
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    def _is_at_version(self, entry: NodeEntry, node_dir: Path) -> bool:
+        """
+        Check whether node_dir is already at entry.version, preferring the
+        marker file (one read) over spawning git processes.
+        """
+        if entry.version not in ('latest', 'nightly') and \
+                self._read_version_marker(node_dir) == entry.version:
+            return True
+        return self._check_version(node_dir, entry.version)
+
+    def _node_dir_present(self, name: str) -> bool:
+        """
+        Check whether a node directory exists, against a one-time scandir
+        snapshot instead of a per-entry stat.
+        """
+        with self._lock:
+            if self._existing is None:
+                try:
+                    with os.scandir(self.custom_nodes_dir) as it:
+                        self._existing = {e.name for e in it if e.is_dir()}
+                except FileNotFoundError:
+                    self._existing = set()
+            return name in self._existing
 
     def install_entry(self, entry: NodeEntry) -> Tuple[bool, str]:
         """
@@ -173,8 +426,8 @@ class NodeInstaller:
         node_dir = self.custom_nodes_dir / entry.repo_name
 
         # Check if already exists
-        if node_dir.exists() and not self.force:
-            if self._check_version(node_dir, entry.version):
+        if self._node_dir_present(entry.repo_name) and not self.force:
+            if self._is_at_version(entry, node_dir):
                 # Node exists at correct version, but still ensure dependencies are installed
                 # (they might be missing after container rebuild)
                 if not self.skip_deps:
@@ -193,14 +446,38 @@ class NodeInstaller:
 
     def _clone_node(self, entry: NodeEntry, node_dir: Path) -> Tuple[bool, str]:
         """Clone a node repository"""
+        self._invalidate_version_cache(node_dir)
         try:
             if self.verbose:
                 print(f"  Cloning {entry.url}...")
 
-            # Clone with --recursive for submodules
+            # Clone with submodules, fetching them in parallel; --quiet keeps
+            # progress output from interleaving across clone workers
+            clone_cmd = ['git', 'clone', '--quiet', '--recurse-submodules', '--jobs=8']
+            shallow = False
+            if entry.version == 'nightly':
+                # Only the tip of the default branch is needed
+                clone_cmd += ['--depth=1', '--filter=blob:none', '--shallow-submodules']
+                shallow = True
+            elif entry.version != 'latest' and not re.fullmatch(r'[0-9a-f]{7,40}', entry.version):
+                # Tag or branch: shallow partial clone of just that ref
+                clone_cmd += [
+                    '--depth=1', '--branch', entry.version, '--single-branch',
+                    '--filter=blob:none', '--shallow-submodules'
+                ]
+                shallow = True
+
+            reference_repo = self._reference_repos.get(entry.url)
+            if reference_repo is None and not shallow:
+                # Full-history clone: reuse pack data from the per-user mirror
+                reference_repo = self._ensure_mirror(entry)
+            if reference_repo:
+                # Borrow objects from the local reference repo
+                clone_cmd += ['--reference', reference_repo, '--dissociate']
             result = subprocess.run(
-                ['git', 'clone', '--recursive', entry.url, str(node_dir)],
+                clone_cmd + [entry.url, str(node_dir)],
                 capture_output=True,
+                close_fds=False,
                 text=True,
                 timeout=300
             )
@@ -214,6 +491,8 @@ class NodeInstaller:
             if not success:
                 return False, f"[ERR] INSTALL FAILED: {msg}"
 
+            self._write_version_marker(entry, node_dir)
+
             # Install dependencies
             if not self.skip_deps:
                 dep_success, dep_msg = self._install_dependencies(entry, node_dir)
@@ -229,33 +508,68 @@ class NodeInstaller:
 
     def _update_node(self, entry: NodeEntry, node_dir: Path) -> Tuple[bool, str]:
         """Update an existing node to a different version"""
+        self._invalidate_version_cache(node_dir)
         try:
             if self.verbose:
                 print(f"  Updating {entry.repo_name}...")
 
-            # Fetch latest changes
-            result = subprocess.run(
-                ['git', '-C', str(node_dir), 'fetch', '--tags', '--all'],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            if entry.version not in ('latest', 'nightly'):
+                # Specific tag/branch/commit: one shell invocation instead of
+                # separate fetch/checkout/submodule process spawns
+                quoted_dir = shlex.quote(str(node_dir))
+                if re.fullmatch(r'[0-9a-f]{7,40}', entry.version):
+                    # Commit-pinned: fetch just that object instead of all refs
+                    fetch_cmd = f'git -C {quoted_dir} fetch origin {shlex.quote(entry.version)} --depth=1 -q'
+                else:
+                    fetch_cmd = f'git -C {quoted_dir} fetch --tags --all -q'
+                chain = (
+                    f'{fetch_cmd} && '
+                    f'git -C {quoted_dir} checkout -q {shlex.quote(entry.version)}'
+                )
+                if (node_dir / '.gitmodules').exists():
+                    chain += f' && git -C {quoted_dir} submodule update --init --recursive --jobs=8 --quiet'
 
-            if result.returncode != 0:
-                error_msg = result.stderr.strip()[:200]
-                return False, f"[ERR] UPDATE FAILED: {entry.repo_name} (fetch error: {error_msg})"
+                result = subprocess.run(
+                    ['sh', '-c', chain],
+                    capture_output=True,
+                    close_fds=False,
+                    text=True,
+                    timeout=120
+                )
 
-            # Checkout specific version
-            success, msg = self._checkout_version(entry, node_dir)
-            if not success:
-                return False, f"[ERR] UPDATE FAILED: {msg}"
+                if result.returncode != 0:
+                    error_msg = result.stderr.strip()[:200]
+                    return False, f"[ERR] UPDATE FAILED: {entry.repo_name} ({error_msg})"
+            else:
+                # Fetch latest changes
+                result = subprocess.run(
+                    ['git', '-C', str(node_dir), 'fetch', '--tags', '--all'],
+                    capture_output=True,
+                    close_fds=False,
+                    text=True,
+                    timeout=60
+                )
 
-            # Update submodules
-            subprocess.run(
-                ['git', '-C', str(node_dir), 'submodule', 'update', '--init', '--recursive'],
-                capture_output=True,
-                timeout=60
-            )
+                if result.returncode != 0:
+                    error_msg = result.stderr.strip()[:200]
+                    return False, f"[ERR] UPDATE FAILED: {entry.repo_name} (fetch error: {error_msg})"
+
+                # Checkout specific version
+                success, msg = self._checkout_version(entry, node_dir)
+                if not success:
+                    return False, f"[ERR] UPDATE FAILED: {msg}"
+
+                # Update submodules in parallel (skip entirely when none are declared)
+                if (node_dir / '.gitmodules').exists():
+                    subprocess.run(
+                        ['git', '-C', str(node_dir), 'submodule', 'update', '--init', '--recursive', '--jobs=8'],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        close_fds=False,
+                        timeout=60
+                    )
+
+            self._write_version_marker(entry, node_dir)
 
             # Install/update dependencies
             if not self.skip_deps:
@@ -276,25 +590,32 @@ class NodeInstaller:
             version = entry.version
 
             if version == 'nightly':
-                # Get default branch and checkout latest
-                result = subprocess.run(
-                    ['git', '-C', str(node_dir), 'symbolic-ref', 'refs/remotes/origin/HEAD'],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    default_branch = result.stdout.strip().split('/')[-1]
-                else:
-                    default_branch = 'main'  # Fallback
+                # Get default branch (cached per repo) and checkout latest
+                default_branch = self._default_branch_cache.get(node_dir)
+                if default_branch is None:
+                    result = subprocess.run(
+                        ['git', '-C', str(node_dir), 'symbolic-ref', 'refs/remotes/origin/HEAD'],
+                        capture_output=True,
+                        close_fds=False,
+                        text=True
+                    )
+                    if result.returncode == 0:
+                        default_branch = result.stdout.strip().split('/')[-1]
+                    else:
+                        default_branch = 'main'  # Fallback
+                    self._default_branch_cache[node_dir] = default_branch
 
                 subprocess.run(
                     ['git', '-C', str(node_dir), 'checkout', default_branch],
                     capture_output=True,
+                    close_fds=False,
                     check=True
                 )
                 subprocess.run(
                     ['git', '-C', str(node_dir), 'pull'],
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=False,
                     check=True
                 )
 
@@ -303,6 +624,7 @@ class NodeInstaller:
                 result = subprocess.run(
                     ['git', '-C', str(node_dir), 'describe', '--tags', '--abbrev=0'],
                     capture_output=True,
+                    close_fds=False,
                     text=True
                 )
                 if result.returncode == 0:
@@ -310,6 +632,7 @@ class NodeInstaller:
                     subprocess.run(
                         ['git', '-C', str(node_dir), 'checkout', latest_tag],
                         capture_output=True,
+                        close_fds=False,
                         check=True
                     )
                 else:
@@ -324,6 +647,7 @@ class NodeInstaller:
                 subprocess.run(
                     ['git', '-C', str(node_dir), 'checkout', version],
                     capture_output=True,
+                    close_fds=False,
                     check=True
                 )
 
@@ -334,19 +658,37 @@ class NodeInstaller:
         except Exception as e:
             return False, f"checkout error: {e}"
 
+    def _invalidate_version_cache(self, node_dir: Path) -> None:
+        """Drop cached version checks for a node_dir that is being mutated"""
+        for key in [k for k in self._version_cache if k[0] == node_dir]:
+            del self._version_cache[key]
+
     def _check_version(self, node_dir: Path, target_version: str) -> bool:
+        """Check if node is at the target version (memoized per run)"""
+        key = (node_dir, target_version)
+        cached = self._version_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._check_version_uncached(node_dir, target_version)
+        self._version_cache[key] = result
+        return result
+
+    def _check_version_uncached(self, node_dir: Path, target_version: str) -> bool:
         """Check if node is at the target version"""
         try:
             if target_version == 'nightly':
                 # For nightly, always update (return False to trigger update)
                 return False
 
+            # Outputs are ASCII refs/hashes; compare raw bytes and skip the
+            # utf-8 decode that text=True would do per call
             if target_version == 'latest':
                 # Check if we're at the latest tag
                 result = subprocess.run(
                     ['git', '-C', str(node_dir), 'describe', '--tags', '--exact-match'],
                     capture_output=True,
-                    text=True
+                    close_fds=False
                 )
                 if result.returncode == 0:
                     current_tag = result.stdout.strip()
@@ -354,7 +696,7 @@ class NodeInstaller:
                     latest_result = subprocess.run(
                         ['git', '-C', str(node_dir), 'describe', '--tags', '--abbrev=0', 'origin/HEAD'],
                         capture_output=True,
-                        text=True
+                        close_fds=False
                     )
                     if latest_result.returncode == 0:
                         latest_tag = latest_result.stdout.strip()
@@ -365,14 +707,14 @@ class NodeInstaller:
             result = subprocess.run(
                 ['git', '-C', str(node_dir), 'rev-parse', 'HEAD'],
                 capture_output=True,
-                text=True
+                close_fds=False
             )
             if result.returncode == 0:
                 current_commit = result.stdout.strip()
                 target_result = subprocess.run(
                     ['git', '-C', str(node_dir), 'rev-parse', target_version],
                     capture_output=True,
-                    text=True
+                    close_fds=False
                 )
                 if target_result.returncode == 0:
                     target_commit = target_result.stdout.strip()
@@ -398,6 +740,7 @@ class NodeInstaller:
             result = subprocess.run(
                 ['uv', 'pip', 'install', '--system', '--no-cache', '-r', str(requirements_file)],
                 capture_output=True,
+                close_fds=False,
                 text=True,
                 timeout=600  # Increased to 10 minutes for heavy packages
             )
@@ -412,80 +755,78 @@ class NodeInstaller:
         except Exception as e:
             return False, str(e)[:200]  # Truncate long errors
 
-    def _collect_all_requirements(self, entries: List[NodeEntry]) -> List[Path]:
+    def _collect_all_requirements(self, entries: List[NodeEntry]) -> List[str]:
         """Collect all requirements.txt files from node directories"""
+        # One scandir pass instead of a stat() per entry - matters on
+        # network-mounted custom_nodes (common in RunPod serverless)
+        try:
+            node_dirs = {d.name: d.path for d in os.scandir(self.custom_nodes_dir) if d.is_dir()}
+        except FileNotFoundError:
+            return []
+
         requirements_files = []
         for entry in entries:
-            node_dir = self.custom_nodes_dir / entry.repo_name
-            req_file = node_dir / "requirements.txt"
-            if req_file.exists():
-                requirements_files.append(req_file)
+            node_path = node_dirs.get(entry.repo_name)
+            if node_path:
+                req_file = os.path.join(node_path, "requirements.txt")
+                if os.path.isfile(req_file):
+                    requirements_files.append(req_file)
         return requirements_files
 
-    def _batch_install_dependencies(self, requirements_files: List[Path]) -> Tuple[bool, str]:
-        """Install all dependencies from multiple requirements files in batches of 10"""
+    def _batch_install_dependencies(self, requirements_files: List[str]) -> Tuple[bool, str]:
+        """Install dependencies from all requirements files with one uv invocation"""
         if not requirements_files:
             return True, "no requirements files found"
 
         try:
             import tempfile
-            import os
 
-            # Collect and deduplicate all requirements
+            # Collect and deduplicate all requirements with a single regex
+            # pass per file instead of per-line Python string ops
             seen_keys = set()
             all_requirements = []
 
             for req_file in requirements_files:
-                with open(req_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        # Skip comments and empty lines
-                        if line and not line.startswith('#'):
-                            # Normalize the requirement (ignore version for deduplication key)
-                            req_key = line.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0].strip()
-                            # Keep the full line with version
-                            if req_key not in seen_keys:
-                                all_requirements.append(line)
-                                seen_keys.add(req_key)
+                text = Path(req_file).read_text('utf-8', errors='replace')
+                for match in _REQ_LINE_RE.finditer(text):
+                    line = match.group(0).strip()
+                    if line.startswith('-'):
+                        # Option lines (-r, --extra-index-url, ...) differ by
+                        # their arguments, so dedupe on the whole line
+                        req_key = line
+                    else:
+                        # Normalize the requirement (ignore version for deduplication key)
+                        req_key = match.group(1).lower()
+                    if req_key not in seen_keys:
+                        # Keep the full line with version
+                        all_requirements.append(line)
+                        seen_keys.add(req_key)
 
             total_packages = len(all_requirements)
-            batch_size = 10
-            num_batches = (total_packages + batch_size - 1) // batch_size
 
             print(f"  [PKG] Batch installing dependencies from {len(requirements_files)} node(s)...", flush=True)
-            print(f"      Total unique packages: {total_packages}", flush=True)
-            print(f"      Installing in {num_batches} batches of {batch_size} packages\n", flush=True)
-
-            # Install in batches of 10
-            for batch_idx in range(num_batches):
-                start_idx = batch_idx * batch_size
-                end_idx = min(start_idx + batch_size, total_packages)
-                batch = all_requirements[start_idx:end_idx]
-
-                print(f"  [PKG] Batch {batch_idx + 1}/{num_batches} ({len(batch)} packages)...", flush=True)
+            print(f"      Total unique packages: {total_packages}\n", flush=True)
 
-                # Create temporary requirements file for this batch
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as batch_file:
-                    for req in batch:
-                        batch_file.write(req + '\n')
-                    batch_path = batch_file.name
+            # Single combined requirements file: the resolver startup cost is
+            # paid once instead of once per node
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as combined_file:
+                combined_file.write('\n'.join(all_requirements) + '\n')
+                combined_path = combined_file.name
 
-                # Install this batch
+            try:
                 result = subprocess.run(
-                    ['uv', 'pip', 'install', '--system', '--no-cache', '-r', batch_path],
-                    timeout=600  # 10 minutes per batch
+                    ['uv', 'pip', 'install', '--system', '--no-cache', '-r', combined_path],
+                    close_fds=False,
+                    timeout=600  # 10 minutes for the whole set
                 )
+            finally:
+                os.unlink(combined_path)
 
-                # Clean up temp file
-                os.unlink(batch_path)
-
-                if result.returncode != 0:
-                    return False, f"UV install failed on batch {batch_idx + 1}/{num_batches} (exit code {result.returncode})"
-
-                print(f"      [OK] Batch {batch_idx + 1}/{num_batches} complete!\n", flush=True)
+            if result.returncode != 0:
+                return False, f"UV install failed (exit code {result.returncode})"
 
-            print(f"  [OK] All batches complete! Installed {total_packages} packages\n", flush=True)
-            return True, f"batch installed {total_packages} packages in {num_batches} batches"
+            print(f"  [OK] Installed {total_packages} packages in one invocation\n", flush=True)
+            return True, f"batch installed {total_packages} packages"
 
         except subprocess.TimeoutExpired:
             return False, "TIMEOUT (batch install took >10 min)"
@@ -505,6 +846,7 @@ class NodeInstaller:
                 ['python', 'install.py'],
                 cwd=str(node_dir),
                 capture_output=True,
+                close_fds=False,
                 text=True,
                 timeout=300  # 5 minutes timeout
             )
@@ -519,7 +861,7 @@ class NodeInstaller:
         except Exception as e:
             return False, f"install script error: {str(e)[:200]}"
 
-    def install_all(self, entries: List[NodeEntry], max_workers: int = 4) -> Dict[str, int]:
+    def install_all(self, entries: List[NodeEntry], max_workers: int = 8) -> Dict[str, int]:
         """Install all node entries using optimized batch installation"""
         if not entries:
             return {"installed": 0, "skipped": 0, "failed": 0}
@@ -529,8 +871,17 @@ class NodeInstaller:
         print(f"  Target: {self.custom_nodes_dir}")
         print(f"{'='*70}\n")
 
-        # Ensure custom_nodes directory exists
+        # Ensure custom_nodes directory exists, then snapshot its contents
+        # once so the per-entry skip checks below avoid a stat each
         self.custom_nodes_dir.mkdir(parents=True, exist_ok=True)
+        with os.scandir(self.custom_nodes_dir) as it:
+            self._existing = {e.name for e in it if e.is_dir()}
+
+        # Resolve 'latest' to concrete tags so those clones can be shallow
+        self._resolve_latest_tags(entries)
+
+        # Deduplicate network fetches for entries sharing the same URL
+        self._prepare_reference_repos(entries)
 
         # PHASE 1: Clone all repos in parallel (without installing deps)
         print(f"  PHASE 1: Cloning repositories ({max_workers} parallel workers)...")
@@ -538,61 +889,73 @@ class NodeInstaller:
         skip_deps_backup = self.skip_deps
         self.skip_deps = True  # Temporarily skip deps during cloning
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Don't allocate thread stacks beyond what the entry count can use
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(entries))) as executor:
             future_to_entry = {executor.submit(self.install_entry, entry): entry for entry in entries}
 
             for future in as_completed(future_to_entry):
                 entry = future_to_entry[future]
                 try:
                     success, message = future.result()
-                    print(f"  {message}")
+                    with self._lock:
+                        print(f"  {message}")
 
-                    if success:
-                        if "already" in message or "skipped" in message:
-                            self.skipped += 1
+                        if success:
+                            if "already" in message or "skipped" in message:
+                                self.skipped += 1
+                            else:
+                                cloned_entries.append(entry)
+                                self.installed += 1
                         else:
-                            cloned_entries.append(entry)
-                            self.installed += 1
-                    else:
-                        self.failed += 1
+                            self.failed += 1
                 except Exception as e:
-                    print(f"  [ERR] CLONE FAILED: {entry.repo_name} (exception: {str(e)[:200]})")
-                    self.failed += 1
+                    with self._lock:
+                        print(f"  [ERR] CLONE FAILED: {entry.repo_name} (exception: {str(e)[:200]})")
+                        self.failed += 1
 
         self.skip_deps = skip_deps_backup
 
-        # PHASE 2: Batch install ALL dependencies with one UV command
+        # PHASE 2: Batch install dependencies for newly-cloned repos only -
+        # re-installing for every node every run re-resolves the world
         if not self.skip_deps and cloned_entries:
             print(f"\n  PHASE 2: Batch installing dependencies...")
-            requirements_files = self._collect_all_requirements(entries)
+            requirements_files = self._collect_all_requirements(cloned_entries)
 
             if requirements_files:
                 success, msg = self._batch_install_dependencies(requirements_files)
                 if success:
                     print(f"      [OK] {msg}")
                 else:
+                    # A single bad pin shouldn't block every node - retry
+                    # each node's requirements on its own
                     print(f"      [ERR] Batch install failed: {msg}")
-                    # Don't fail the whole process, continue with install scripts
+                    print(f"      [PKG] Falling back to per-node dependency install...")
+                    for entry in cloned_entries:
+                        node_dir = self.custom_nodes_dir / entry.repo_name
+                        dep_success, dep_msg = self._install_dependencies(entry, node_dir)
+                        if not dep_success:
+                            print(f"      [ERR] {entry.repo_name}: {dep_msg}")
             else:
                 print(f"      [INFO] No requirements.txt files found")
+        elif not self.skip_deps:
+            print(f"\n  [OK] No new clones, skipping batch dependency install")
 
         # PHASE 3: Run all install.py scripts in parallel
         print(f"\n  PHASE 3: Running install scripts...")
-        install_script_count = 0
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_entry = {}
 
-            for entry in entries:
-                node_dir = self.custom_nodes_dir / entry.repo_name
-                install_script = node_dir / "install.py"
+        script_entries = []
+        for entry in entries:
+            node_dir = self.custom_nodes_dir / entry.repo_name
+            if (node_dir / "install.py").exists():
+                script_entries.append((entry, node_dir))
 
-                if install_script.exists():
-                    future = executor.submit(self._run_install_script, entry, node_dir)
-                    future_to_entry[future] = entry
-                    install_script_count += 1
+        if script_entries:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(script_entries))) as executor:
+                future_to_entry = {
+                    executor.submit(self._run_install_script, entry, node_dir): entry
+                    for entry, node_dir in script_entries
+                }
 
-            if install_script_count > 0:
                 for future in as_completed(future_to_entry):
                     entry = future_to_entry[future]
                     try:
@@ -603,8 +966,11 @@ class NodeInstaller:
                             print(f"      [ERR] {entry.repo_name}: {msg}")
                     except Exception as e:
                         print(f"      [ERR] {entry.repo_name}: install script exception: {str(e)[:200]}")
-            else:
-                print(f"      [INFO] No install scripts to run")
+        else:
+            print(f"      [INFO] No install scripts to run")
+
+        # Drop cache repos that no longer back any configured entry
+        self._cleanup_reference_repos()
 
         print(f"\n{'='*70}")
         print(f"  Summary: {self.installed} installed, {self.skipped} skipped, {self.failed} failed")
@@ -630,12 +996,15 @@ class NodeInstaller:
         if self.skip_deps:
             return {"deps_installed": 0, "deps_failed": 0}
 
-        if not self.custom_nodes_dir.exists():
+        # One scandir pass instead of iterdir + per-dir stat calls
+        try:
+            all_node_dirs = [
+                d for d in os.scandir(self.custom_nodes_dir)
+                if d.is_dir() and not d.name.startswith('.')
+            ]
+        except FileNotFoundError:
             return {"deps_installed": 0, "deps_failed": 0}
 
-        # Find all directories in custom_nodes
-        all_node_dirs = [d for d in self.custom_nodes_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
-
         # Filter to only orphaned nodes (not in config.yml)
         orphaned_nodes = [d for d in all_node_dirs if d.name not in processed_nodes]
 
@@ -650,37 +1019,54 @@ class NodeInstaller:
         deps_installed = 0
         deps_failed = 0
 
-        for node_dir in orphaned_nodes:
-            requirements_file = node_dir / "requirements.txt"
+        def install_orphan(node_dir) -> Optional[bool]:
+            """Install one orphan's dependencies. Returns None when it has none."""
+            requirements_file = os.path.join(node_dir.path, "requirements.txt")
 
-            if not requirements_file.exists():
-                print(f"  [OK] {node_dir.name} (no requirements)")
-                continue
+            if not os.path.isfile(requirements_file):
+                with self._lock:
+                    print(f"  [OK] {node_dir.name} (no requirements)")
+                return None
 
             try:
-                print(f"  [PKG] Installing dependencies for {node_dir.name}...", flush=True)
+                with self._lock:
+                    print(f"  [PKG] Installing dependencies for {node_dir.name}...", flush=True)
 
                 # Using uv for 10-100x faster downloads with parallel connections
                 result = subprocess.run(
-                    ['uv', 'pip', 'install', '--system', '--no-cache', '-r', str(requirements_file)],
+                    ['uv', 'pip', 'install', '--system', '--no-cache', '-r', requirements_file],
                     capture_output=True,
+                    close_fds=False,
                     text=True,
                     timeout=600
                 )
 
                 if result.returncode != 0:
-                    print(f"  [X] {node_dir.name} (dependencies failed: {result.stderr.strip()[:100]})")
-                    deps_failed += 1
-                else:
+                    with self._lock:
+                        print(f"  [X] {node_dir.name} (dependencies failed: {result.stderr.strip()[:100]})")
+                    return False
+
+                with self._lock:
                     print(f"  [OK] {node_dir.name} (dependencies installed)")
-                    deps_installed += 1
+                return True
 
             except subprocess.TimeoutExpired:
-                print(f"  [X] {node_dir.name} (TIMEOUT installing dependencies)")
-                deps_failed += 1
+                with self._lock:
+                    print(f"  [X] {node_dir.name} (TIMEOUT installing dependencies)")
+                return False
             except Exception as e:
-                print(f"  [X] {node_dir.name} (error: {str(e)[:100]})")
-                deps_failed += 1
+                with self._lock:
+                    print(f"  [X] {node_dir.name} (error: {str(e)[:100]})")
+                return False
+
+        # Fewer workers than the clone pool - pip installs can be CPU-bound
+        # when packages compile on install
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for success in executor.map(install_orphan, orphaned_nodes):
+                if success is True:
+                    deps_installed += 1
+                elif success is False:
+                    deps_failed += 1
 
         print(f"\n{'='*70}")
         print(f"  Orphaned dependencies: {deps_installed} installed, {deps_failed} failed")
@@ -738,8 +1124,8 @@ def main():
     parser.add_argument(
         "--max-workers",
         type=int,
-        default=4,
-        help="Number of parallel workers for installation (default: 4)"
+        default=8,
+        help="Number of parallel workers for installation (default: 8)"
     )
     parser.add_argument(
         "--orphans-only",
@@ -749,10 +1135,8 @@ def main():
 
     args = parser.parse_args()
 
-    # Check git is available
-    try:
-        subprocess.run(['git', '--version'], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    # Check git is available (PATH lookup, no subprocess needed)
+    if shutil.which('git') is None:
         print("Error: git is not installed or not in PATH")
         return 1
 
@@ -824,21 +1208,16 @@ def main():
     print(f"\n[OK] Found {len(entries)} custom node(s) to install")
 
     # Group by version type for display
-    by_version = {"latest": [], "nightly": [], "specific": []}
+    by_version = defaultdict(list)
     for entry in entries:
-        if entry.version == "latest":
-            by_version["latest"].append(entry)
-        elif entry.version == "nightly":
-            by_version["nightly"].append(entry)
-        else:
-            by_version["specific"].append(entry)
+        by_version['specific' if entry.version not in ('latest', 'nightly') else entry.version].append(entry)
 
     print(f"\nBreakdown:")
-    if by_version["latest"]:
+    if by_version.get("latest"):
         print(f"  - Latest stable: {len(by_version['latest'])} node(s)")
-    if by_version["nightly"]:
+    if by_version.get("nightly"):
         print(f"  - Nightly builds: {len(by_version['nightly'])} node(s)")
-    if by_version["specific"]:
+    if by_version.get("specific"):
         print(f"  - Specific versions: {len(by_version['specific'])} node(s)")
 
     if args.validate_only:
@@ -855,6 +1234,13 @@ def main():
         print()
         return 0
 
+    # Surface likely-dead URLs up front; the clone itself stays the
+    # authoritative check (private repos answer 404 to anonymous HEADs)
+    preflight_start = len(file_parser.warnings)
+    file_parser.preflight_urls(entries)
+    for warning in file_parser.warnings[preflight_start:]:
+        print(f"  [WARN] {warning}")
+
     # Install nodes
     installer = NodeInstaller(
         args.comfyui_dir,
@@ -9,10 +9,15 @@ Requires boto3 and the following environment variables to be configured:
 - BUCKET_NAME: S3 bucket name (optional, defaults to "comfyui-outputs")
 """
 
+import asyncio
+import gzip
+import io
+import mmap
 import os
 import logging
-from typing import Optional, Dict, Any
-from pathlib import Path
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,43 +25,182 @@ logger = logging.getLogger(__name__)
 # Try to import boto3, but make it optional
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
     from botocore.exceptions import ClientError, BotoCoreError
+    from s3transfer.manager import TransferManager
     BOTO3_AVAILABLE = True
+
+    # Multipart + concurrent parts: large outputs upload over several TCP
+    # streams instead of one, with a chunk size sized for RunPod egress
+    _TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=10,
+        max_io_queue=100,
+        io_chunksize=1024 * 1024,
+        use_threads=True
+    )
+
+    # Wider concurrency for batch uploads: parallelism spans files, not
+    # just parts of one file
+    _BATCH_TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=32,
+        use_threads=True
+    )
+
+    # Client HTTP settings built once; a big pool plus keep-alive means
+    # sequential uploads reuse warm TLS sessions instead of re-handshaking
+    _CLIENT_CFG = Config(
+        max_pool_connections=64,
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=60,
+        retries={'max_attempts': 10, 'mode': 'adaptive'}
+    )
+
+    # One long-lived session: every client built from it shares the loaded
+    # service models instead of re-reading them from disk
+    _BOTO_SESSION = boto3.session.Session()
 except ImportError:
     BOTO3_AVAILABLE = False
     logger.warning("boto3 not installed. S3 upload functionality will be disabled.")
 
+# Optionally use the AWS Common Runtime (CRT) transfer manager. CRT does
+# multipart uploads in native C threads, so large output batches are not
+# throttled by the GIL. Purely opt-in: install awscrt to enable it.
+try:
+    import awscrt  # noqa: F401
+    import botocore.session
+    from s3transfer.crt import (
+        BotocoreCRTRequestSerializer,
+        CRTTransferManager,
+        create_s3_crt_client
+    )
+    CRT_AVAILABLE = True
+except ImportError:
+    CRT_AVAILABLE = False
+
+# Optional async client for fanning out many uploads on one event loop
+try:
+    import aioboto3
+    AIOBOTO3_AVAILABLE = True
+except ImportError:
+    AIOBOTO3_AVAILABLE = False
+
+# Cached S3 client: building one re-parses env vars, loads service models,
+# and opens fresh TLS connections, so pay that cost only once per worker
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+# Environment snapshot taken at import: these values never change during the
+# lifetime of a worker, so re-reading them on every upload is wasted work
+_BUCKET_ENDPOINT_URL = (os.getenv("BUCKET_ENDPOINT_URL") or "").rstrip('/')
+_DEFAULT_BUCKET = os.getenv("BUCKET_NAME", "comfyui-outputs")
+
+# Client construction kwargs, frozen at import so get_s3_client() is a
+# single boto3.client call with no env traversal
+_CLIENT_KWARGS = {
+    'endpoint_url': os.getenv("BUCKET_ENDPOINT_URL"),
+    'aws_access_key_id': os.getenv("BUCKET_ACCESS_KEY_ID"),
+    'aws_secret_access_key': os.getenv("BUCKET_SECRET_ACCESS_KEY")
+}
+
+# Lazily computed configuration check (None = not checked yet)
+_S3_CONFIGURED: Optional[bool] = None
+
+# Cached CRT transfer manager (created lazily, shared across uploads)
+_crt_manager = None
+_crt_manager_lock = threading.Lock()
+
+# Background pool for fire-and-forget uploads; the semaphore bounds
+# in-flight submissions so a burst of outputs cannot queue without limit
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='s3up')
+_upload_slots = threading.BoundedSemaphore(32)
+
+
+def _get_crt_manager():
+    """
+    Return the shared CRT transfer manager, or None if awscrt is unavailable.
+
+    Built once and cached; if construction fails (unsupported platform,
+    incompatible s3transfer version) we disable CRT for the rest of the
+    process and fall back to the stock boto3 upload path.
+    """
+    global _crt_manager, CRT_AVAILABLE
+
+    if not CRT_AVAILABLE:
+        return None
+
+    if _crt_manager is not None:
+        return _crt_manager
+
+    with _crt_manager_lock:
+        if _crt_manager is None and CRT_AVAILABLE:
+            try:
+                session = botocore.session.Session()
+                crt_client = create_s3_crt_client(
+                    region=os.getenv("AWS_REGION", "auto"),
+                    target_throughput_gbps=10,
+                    part_size=16 * 1024 * 1024
+                )
+                _crt_manager = CRTTransferManager(
+                    crt_client,
+                    BotocoreCRTRequestSerializer(session)
+                )
+                logger.info("Using CRT transfer manager for S3 uploads")
+            except Exception as e:
+                CRT_AVAILABLE = False
+                logger.warning("CRT transfer manager unavailable, using boto3: %s", e)
+
+    return _crt_manager
+
 
 def is_s3_configured() -> bool:
     """
     Check if S3 is properly configured with all required environment variables.
 
+    The result is computed once and cached; credentials are supplied via the
+    environment at worker start and do not change mid-run.
+
     Returns:
         bool: True if all required S3 environment variables are set, False otherwise
     """
+    global _S3_CONFIGURED
+
+    if _S3_CONFIGURED is not None:
+        return _S3_CONFIGURED
+
     if not BOTO3_AVAILABLE:
+        _S3_CONFIGURED = False
         return False
 
-    required_vars = [
-        "BUCKET_ENDPOINT_URL",
-        "BUCKET_ACCESS_KEY_ID",
-        "BUCKET_SECRET_ACCESS_KEY"
-    ]
+    required_vars = {
+        "BUCKET_ENDPOINT_URL": 'endpoint_url',
+        "BUCKET_ACCESS_KEY_ID": 'aws_access_key_id',
+        "BUCKET_SECRET_ACCESS_KEY": 'aws_secret_access_key'
+    }
 
-    configured = all(os.getenv(var) for var in required_vars)
+    missing = [var for var, key in required_vars.items() if not _CLIENT_KWARGS[key]]
+    configured = not missing
 
     if configured:
         logger.info("S3 is configured and available")
     else:
-        missing = [var for var in required_vars if not os.getenv(var)]
-        logger.info(f"S3 not configured. Missing variables: {', '.join(missing)}")
+        logger.info("S3 not configured. Missing variables: %s", ', '.join(missing))
 
+    _S3_CONFIGURED = configured
     return configured
 
 
 def get_s3_client():
     """
-    Create and return an S3 client configured with environment variables.
+    Return the shared S3 client, creating it on first use.
+
+    The client is cached at module level so repeated uploads reuse the same
+    botocore session and pooled HTTP connections.
 
     Returns:
         boto3.client: Configured S3 client
@@ -64,30 +208,43 @@ def get_s3_client():
     Raises:
         ValueError: If S3 is not properly configured
     """
+    global _s3_client
+
+    if _s3_client is not None:
+        return _s3_client
+
     if not BOTO3_AVAILABLE:
         raise ValueError("boto3 is not installed")
 
     if not is_s3_configured():
         raise ValueError("S3 is not properly configured")
 
-    endpoint_url = os.getenv("BUCKET_ENDPOINT_URL")
-    access_key_id = os.getenv("BUCKET_ACCESS_KEY_ID")
-    secret_access_key = os.getenv("BUCKET_SECRET_ACCESS_KEY")
-
     try:
-        s3_client = boto3.client(
-            's3',
-            endpoint_url=endpoint_url,
-            aws_access_key_id=access_key_id,
-            aws_secret_access_key=secret_access_key
-        )
-        logger.info(f"S3 client created for endpoint: {endpoint_url}")
-        return s3_client
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = _BOTO_SESSION.client('s3', config=_CLIENT_CFG, **_CLIENT_KWARGS)
+                logger.info("S3 client created for endpoint: %s", _BUCKET_ENDPOINT_URL)
+        return _s3_client
     except Exception as e:
-        logger.error(f"Failed to create S3 client: {str(e)}")
+        logger.error("Failed to create S3 client: %s", e)
         raise
 
 
+def reset_s3_client() -> None:
+    """Drop the cached S3 client (for tests or after credential changes)."""
+    global _s3_client, _S3_CONFIGURED, _BUCKET_ENDPOINT_URL, _DEFAULT_BUCKET
+    with _s3_client_lock:
+        _s3_client = None
+        _S3_CONFIGURED = None
+        _BUCKET_ENDPOINT_URL = (os.getenv("BUCKET_ENDPOINT_URL") or "").rstrip('/')
+        _DEFAULT_BUCKET = os.getenv("BUCKET_NAME", "comfyui-outputs")
+        _CLIENT_KWARGS.update(
+            endpoint_url=os.getenv("BUCKET_ENDPOINT_URL"),
+            aws_access_key_id=os.getenv("BUCKET_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("BUCKET_SECRET_ACCESS_KEY")
+        )
+
+
 def upload_file_to_s3(
     file_path: str,
     object_name: Optional[str] = None,
@@ -111,7 +268,10 @@ def upload_file_to_s3(
     Raises:
         ValueError: If S3 is not configured or file doesn't exist
     """
-    if not os.path.exists(file_path):
+    # One stat serves both the existence check and the size-based path choice
+    try:
+        file_size = os.stat(file_path).st_size
+    except FileNotFoundError:
         raise ValueError(f"File not found: {file_path}")
 
     if not is_s3_configured():
@@ -119,29 +279,39 @@ def upload_file_to_s3(
 
     # Use filename if object_name not specified
     if object_name is None:
-        object_name = Path(file_path).name
+        object_name = os.path.basename(file_path)
 
     # Get bucket name from env or use default
     if bucket_name is None:
-        bucket_name = os.getenv("BUCKET_NAME", "comfyui-outputs")
+        bucket_name = _DEFAULT_BUCKET
 
     try:
-        s3_client = get_s3_client()
-
         # Upload the file
-        logger.info(f"Uploading {file_path} to s3://{bucket_name}/{object_name}")
-        s3_client.upload_file(file_path, bucket_name, object_name)
-
-        # Construct public URL
-        endpoint_url = os.getenv("BUCKET_ENDPOINT_URL")
-        # Remove trailing slash if present
-        endpoint_url = endpoint_url.rstrip('/')
+        logger.info("Uploading %s to s3://%s/%s", file_path, bucket_name, object_name)
+        crt_manager = _get_crt_manager()
+        if crt_manager is not None:
+            with open(file_path, 'rb') as fileobj:
+                crt_manager.upload(fileobj, bucket_name, object_name).result()
+        else:
+            s3_client = get_s3_client()
+            if file_size < _TRANSFER_CONFIG.multipart_threshold:
+                # Small files: a single unbuffered PUT, no multipart bookkeeping
+                with open(file_path, 'rb', buffering=0) as f:
+                    s3_client.put_object(Bucket=bucket_name, Key=object_name, Body=f)
+            else:
+                # Large files: mmap streams straight from the page cache
+                # without an intermediate bytes copy in user space
+                with open(file_path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    s3_client.upload_fileobj(
+                        mapped, bucket_name, object_name, Config=_TRANSFER_CONFIG
+                    )
 
         # Construct URL based on endpoint format
         # Most S3-compatible services use: endpoint_url/bucket_name/object_name
-        public_url = f"{endpoint_url}/{bucket_name}/{object_name}"
+        public_url = f"{_BUCKET_ENDPOINT_URL}/{bucket_name}/{object_name}"
 
-        logger.info(f"Successfully uploaded to: {public_url}")
+        logger.info("Successfully uploaded to: %s", public_url)
 
         return {
             "success": True,
@@ -172,7 +342,8 @@ def upload_bytes_to_s3(
     file_bytes: bytes,
     object_name: str,
     bucket_name: Optional[str] = None,
-    content_type: Optional[str] = None
+    content_type: Optional[str] = None,
+    compress: bool = False
 ) -> Dict[str, Any]:
     """
     Upload file bytes to S3 and return the public URL.
@@ -182,6 +353,9 @@ def upload_bytes_to_s3(
         object_name: S3 object name
         bucket_name: S3 bucket name (defaults to BUCKET_NAME env var or "comfyui-outputs")
         content_type: MIME type of the file (e.g., "image/png")
+        compress: Gzip text-like payloads (JSON, text) before upload and set
+            Content-Encoding. Images are left alone (already entropy-coded),
+            as is any payload gzip fails to shrink.
 
     Returns:
         Dict containing:
@@ -195,31 +369,41 @@ def upload_bytes_to_s3(
 
     # Get bucket name from env or use default
     if bucket_name is None:
-        bucket_name = os.getenv("BUCKET_NAME", "comfyui-outputs")
+        bucket_name = _DEFAULT_BUCKET
 
     try:
         s3_client = get_s3_client()
 
         # Prepare upload kwargs
-        upload_kwargs = {}
+        extra_args = {}
         if content_type:
-            upload_kwargs['ContentType'] = content_type
-
-        # Upload the bytes
-        logger.info(f"Uploading bytes to s3://{bucket_name}/{object_name}")
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=object_name,
-            Body=file_bytes,
-            **upload_kwargs
+            extra_args['ContentType'] = content_type
+
+        # Fewer bytes on the wire beats CPU cost for text-like payloads
+        if compress and content_type and (
+            content_type.startswith('text/') or 'json' in content_type
+        ):
+            compressed = gzip.compress(file_bytes, compresslevel=3)
+            if len(compressed) < len(file_bytes):
+                file_bytes = compressed
+                extra_args['ContentEncoding'] = 'gzip'
+
+        # Upload the bytes; upload_fileobj splits payloads above the
+        # multipart threshold into concurrent parts instead of pushing
+        # the whole blob through a single PUT
+        logger.info("Uploading bytes to s3://%s/%s", bucket_name, object_name)
+        s3_client.upload_fileobj(
+            io.BytesIO(file_bytes),
+            bucket_name,
+            object_name,
+            ExtraArgs=extra_args,
+            Config=_TRANSFER_CONFIG
         )
 
         # Construct public URL
-        endpoint_url = os.getenv("BUCKET_ENDPOINT_URL")
-        endpoint_url = endpoint_url.rstrip('/')
-        public_url = f"{endpoint_url}/{bucket_name}/{object_name}"
+        public_url = f"{_BUCKET_ENDPOINT_URL}/{bucket_name}/{object_name}"
 
-        logger.info(f"Successfully uploaded to: {public_url}")
+        logger.info("Successfully uploaded to: %s", public_url)
 
         return {
             "success": True,
@@ -244,3 +428,201 @@ def upload_bytes_to_s3(
             "error": error_msg,
             "object_name": object_name
         }
+
+
+def upload_files_to_s3(
+    paths: List[tuple],
+    bucket_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Upload several local files through one shared TransferManager.
+
+    All files share a single thread pool and the client's pooled
+    connections, so per-file setup cost is paid once per batch instead
+    of once per image.
+
+    Args:
+        paths: List of (file_path, object_name) tuples
+        bucket_name: S3 bucket name (defaults to BUCKET_NAME env var or "comfyui-outputs")
+
+    Returns:
+        List of dicts matching the upload_file_to_s3 result format, in the
+        same order as paths
+
+    Raises:
+        ValueError: If S3 is not properly configured
+    """
+    if not is_s3_configured():
+        raise ValueError("S3 is not properly configured")
+
+    if bucket_name is None:
+        bucket_name = _DEFAULT_BUCKET
+
+    s3_client = get_s3_client()
+    results = []
+
+    with TransferManager(s3_client, _BATCH_TRANSFER_CONFIG) as manager:
+        futures = [
+            (object_name, manager.upload(file_path, bucket_name, object_name))
+            for file_path, object_name in paths
+        ]
+        for object_name, future in futures:
+            try:
+                future.result()
+                results.append({
+                    "success": True,
+                    "url": f"{_BUCKET_ENDPOINT_URL}/{bucket_name}/{object_name}",
+                    "object_name": object_name,
+                    "bucket_name": bucket_name
+                })
+            except Exception as e:
+                error_msg = f"S3 upload error: {str(e)}"
+                logger.error(error_msg)
+                results.append({
+                    "success": False,
+                    "error": error_msg,
+                    "object_name": object_name
+                })
+
+    return results
+
+
+async def upload_files_async(
+    paths: List[str],
+    bucket_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Upload several files concurrently and return one result dict per file.
+
+    With aioboto3 installed the uploads share a single async S3 client and
+    overlap on one event loop; otherwise each file falls back to the blocking
+    upload_file_to_s3 path run in a worker thread. Callers invoke this once
+    per job via asyncio.run(upload_files_async(paths)).
+
+    Args:
+        paths: Local file paths to upload
+        bucket_name: S3 bucket name (defaults to BUCKET_NAME env var or "comfyui-outputs")
+
+    Returns:
+        List of dicts matching the upload_file_to_s3 result format, in the
+        same order as paths
+
+    Raises:
+        ValueError: If S3 is not properly configured
+    """
+    if not is_s3_configured():
+        raise ValueError("S3 is not properly configured")
+
+    if bucket_name is None:
+        bucket_name = _DEFAULT_BUCKET
+
+    if not AIOBOTO3_AVAILABLE:
+        return list(await asyncio.gather(
+            *(asyncio.to_thread(upload_file_to_s3, path, None, bucket_name)
+              for path in paths)
+        ))
+
+    endpoint_url = _BUCKET_ENDPOINT_URL
+    session = aioboto3.Session()
+
+    async with session.client(
+        's3',
+        endpoint_url=endpoint_url,
+        aws_access_key_id=os.getenv("BUCKET_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("BUCKET_SECRET_ACCESS_KEY")
+    ) as client:
+
+        async def upload_one(path: str) -> Dict[str, Any]:
+            object_name = os.path.basename(path)
+            try:
+                await client.upload_file(path, bucket_name, object_name)
+                return {
+                    "success": True,
+                    "url": f"{endpoint_url}/{bucket_name}/{object_name}",
+                    "object_name": object_name,
+                    "bucket_name": bucket_name
+                }
+            except Exception as e:
+                error_msg = f"S3 upload error: {str(e)}"
+                logger.error(error_msg)
+                return {
+                    "success": False,
+                    "error": error_msg,
+                    "object_name": object_name
+                }
+
+        return list(await asyncio.gather(*(upload_one(path) for path in paths)))
+
+
+def submit_upload(
+    file_path: str,
+    object_name: Optional[str] = None,
+    bucket_name: Optional[str] = None
+) -> Future:
+    """
+    Queue an upload on the shared background pool and return its Future.
+
+    Lets the caller overlap S3 PUT latency with other work (e.g. the next
+    ComfyUI poll) and collect results later via gather_uploads(). In-flight
+    submissions are bounded so a burst of outputs cannot pile up unbounded
+    memory or sockets.
+
+    Args:
+        file_path: Path to the file to upload
+        object_name: S3 object name (defaults to filename)
+        bucket_name: S3 bucket name (defaults to BUCKET_NAME env var or "comfyui-outputs")
+
+    Returns:
+        Future resolving to an upload_file_to_s3 result dict
+    """
+    _upload_slots.acquire()
+
+    def _run() -> Dict[str, Any]:
+        try:
+            return upload_file_to_s3(file_path, object_name, bucket_name)
+        finally:
+            _upload_slots.release()
+
+    try:
+        return _UPLOAD_POOL.submit(_run)
+    except BaseException:
+        _upload_slots.release()
+        raise
+
+
+def gather_uploads(futures: List[Future]) -> List[Dict[str, Any]]:
+    """
+    Block until all queued uploads finish and return their result dicts.
+
+    Exceptions (e.g. ValueError from a missing file) are folded into the
+    standard failure dict so one bad file does not lose the batch.
+    """
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            error_msg = f"Unexpected error during S3 upload: {str(e)}"
+            logger.error(error_msg)
+            results.append({
+                "success": False,
+                "error": error_msg,
+                "object_name": None
+            })
+    return results
+
+
+def _prewarm_connection() -> None:
+    """Open a TLS session to the bucket so the first upload skips the handshake."""
+    try:
+        get_s3_client().head_bucket(Bucket=_DEFAULT_BUCKET)
+        logger.info("S3 connection pre-warmed")
+    except Exception as e:
+        # Best effort: missing permissions or a cold bucket must not break import
+        logger.debug("S3 pre-warm skipped: %s", e)
+
+
+# Warm the connection pool in the background when S3 is configured, so the
+# first real upload observes steady-state latency
+if BOTO3_AVAILABLE and is_s3_configured():
+    threading.Thread(target=_prewarm_connection, daemon=True).start()
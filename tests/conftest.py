@@ -0,0 +1,23 @@
+"""Shared pytest configuration for the test suite.
+
+The YAML-heavy tests are written against the libyaml C backend
+(yaml.CSafeLoader / yaml.CSafeDumper), which parses roughly 5-10x faster
+than the pure-Python fallback. The default PyYAML wheels ship the C
+extension; if it is missing the tests still pass via the pure-Python
+loader, just slower.
+"""
+import warnings
+
+import pytest
+import yaml
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _require_libyaml():
+    """Warn once per session if the libyaml C backend is unavailable."""
+    if not getattr(yaml, "__with_libyaml__", False):
+        warnings.warn(
+            "PyYAML was built without libyaml; YAML tests will run on the "
+            "slower pure-Python parser",
+            RuntimeWarning
+        )
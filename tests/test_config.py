@@ -4,6 +4,68 @@ from pathlib import Path
 import tempfile
 import yaml
 
+# libyaml-backed C loader/dumper when available (5-10x faster than pure Python)
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+
+# Fixture configs are constants, so serialize them once at import instead
+# of re-running yaml.dump inside every test's setup
+_SAMPLE_CFG = {
+    "models": [
+        {
+            "url": "https://example.com/model1.safetensors",
+            "destination": "checkpoints"
+        },
+        {
+            "url": "https://example.com/model2.safetensors",
+            "destination": "vae",
+            "optional": True
+        },
+        {
+            "url": "https://example.com/model3.ckpt",
+            "destination": "loras"
+        }
+    ],
+    "nodes": [
+        {
+            "url": "https://github.com/user/repo1.git",
+            "version": "latest"
+        },
+        {
+            "url": "https://github.com/user/repo2.git",
+            "version": "v1.0.5"
+        },
+        {
+            "url": "https://github.com/user/repo3.git",
+            "version": "nightly"
+        }
+    ]
+}
+_MINIMAL_CFG = {
+    "models": [
+        {
+            "url": "https://example.com/model.safetensors",
+            "destination": "checkpoints"
+        }
+    ],
+    "nodes": [
+        {
+            "url": "https://github.com/user/repo.git",
+            "version": "latest"
+        }
+    ]
+}
+_EMPTY_CFG = {
+    "models": [],
+    "nodes": []
+}
+_SAMPLE_YAML = yaml.dump(_SAMPLE_CFG, Dumper=SafeDumper).encode()
+_MINIMAL_YAML = yaml.dump(_MINIMAL_CFG, Dumper=SafeDumper).encode()
+_EMPTY_YAML = yaml.dump(_EMPTY_CFG, Dumper=SafeDumper).encode()
+
 
 @pytest.fixture
 def temp_dir():
@@ -12,76 +74,27 @@ def temp_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture
-def sample_config_yml(temp_dir):
-    """Create sample config.yml file"""
-    config_file = temp_dir / "config.yml"
-    config = {
-        "models": [
-            {
-                "url": "https://example.com/model1.safetensors",
-                "destination": "checkpoints"
-            },
-            {
-                "url": "https://example.com/model2.safetensors",
-                "destination": "vae",
-                "optional": True
-            },
-            {
-                "url": "https://example.com/model3.ckpt",
-                "destination": "loras"
-            }
-        ],
-        "nodes": [
-            {
-                "url": "https://github.com/user/repo1.git",
-                "version": "latest"
-            },
-            {
-                "url": "https://github.com/user/repo2.git",
-                "version": "v1.0.5"
-            },
-            {
-                "url": "https://github.com/user/repo3.git",
-                "version": "nightly"
-            }
-        ]
-    }
-    config_file.write_text(yaml.dump(config))
+@pytest.fixture(scope="session")
+def sample_config_yml(tmp_path_factory):
+    """Create sample config.yml file (session-scoped: read-only in tests)"""
+    config_file = tmp_path_factory.mktemp("cfg") / "config.yml"
+    config_file.write_bytes(_SAMPLE_YAML)
     return config_file
 
 
-@pytest.fixture
-def minimal_config_yml(temp_dir):
-    """Create minimal valid config.yml"""
-    config_file = temp_dir / "config.yml"
-    config = {
-        "models": [
-            {
-                "url": "https://example.com/model.safetensors",
-                "destination": "checkpoints"
-            }
-        ],
-        "nodes": [
-            {
-                "url": "https://github.com/user/repo.git",
-                "version": "latest"
-            }
-        ]
-    }
-    config_file.write_text(yaml.dump(config))
+@pytest.fixture(scope="session")
+def minimal_config_yml(tmp_path_factory):
+    """Create minimal valid config.yml (session-scoped: read-only in tests)"""
+    config_file = tmp_path_factory.mktemp("cfg") / "config.yml"
+    config_file.write_bytes(_MINIMAL_YAML)
     return config_file
 
 
-@pytest.fixture
-def empty_config_yml(temp_dir):
-    """Create empty config.yml"""
-    config_file = temp_dir / "config.yml"
-    config = {
-        "models": [],
-        "nodes": []
-    }
-    config_file.write_text(yaml.dump(config))
+@pytest.fixture(scope="session")
+def empty_config_yml(tmp_path_factory):
+    """Create empty config.yml (session-scoped: read-only in tests)"""
+    config_file = tmp_path_factory.mktemp("cfg") / "config.yml"
+    config_file.write_bytes(_EMPTY_YAML)
     return config_file
 
 
@@ -91,7 +104,7 @@ class TestConfigYAMLStructure:
     def test_valid_config_loads(self, sample_config_yml):
         """Test that valid config.yml can be loaded"""
         with open(sample_config_yml) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         assert "models" in config
         assert "nodes" in config
@@ -101,7 +114,7 @@ class TestConfigYAMLStructure:
     def test_models_section_structure(self, sample_config_yml):
         """Test models section has correct structure"""
         with open(sample_config_yml) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         assert len(config["models"]) == 3
 
@@ -114,7 +127,7 @@ class TestConfigYAMLStructure:
     def test_nodes_section_structure(self, sample_config_yml):
         """Test nodes section has correct structure"""
         with open(sample_config_yml) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         assert len(config["nodes"]) == 3
 
@@ -127,7 +140,7 @@ class TestConfigYAMLStructure:
     def test_optional_field_in_models(self, sample_config_yml):
         """Test optional field is correctly parsed"""
         with open(sample_config_yml) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         model_with_optional = config["models"][1]
         assert "optional" in model_with_optional
@@ -136,7 +149,7 @@ class TestConfigYAMLStructure:
     def test_empty_config_is_valid(self, empty_config_yml):
         """Test that empty models/nodes lists are valid"""
         with open(empty_config_yml) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         assert config["models"] == []
         assert config["nodes"] == []
@@ -148,62 +161,68 @@ class TestConfigYAMLStructure:
         assert not nonexistent.exists()
 
 
-class TestConfigYAMLValidation:
-    """Test validation of config.yml contents"""
-
-    def test_valid_model_destinations(self, temp_dir):
-        """Test valid model destinations"""
-        valid_destinations = [
-            "checkpoints", "vae", "loras", "controlnet", "clip_vision",
-            "embeddings", "upscale_models", "diffusion_models",
-            "text_encoders", "clip", "configs", "sams", "detection",
-            "unet", "style_models", "hypernetworks"
+def _model_config_bytes(destination):
+    """Serialize a one-model config targeting the given destination"""
+    config = {
+        "models": [
+            {
+                "url": "https://example.com/model.safetensors",
+                "destination": destination
+            }
         ]
+    }
+    return yaml.dump(config, Dumper=SafeDumper).encode()
+
 
-        for dest in valid_destinations:
-            config_file = temp_dir / f"config_{dest}.yml"
-            config = {
-                "models": [
-                    {
-                        "url": "https://example.com/model.safetensors",
-                        "destination": dest
-                    }
-                ]
+def _node_config_bytes(version):
+    """Serialize a one-node config pinned to the given version"""
+    config = {
+        "nodes": [
+            {
+                "url": "https://github.com/user/repo.git",
+                "version": version
             }
-            config_file.write_text(yaml.dump(config))
+        ]
+    }
+    return yaml.dump(config, Dumper=SafeDumper).encode()
 
-            with open(config_file) as f:
-                loaded = yaml.safe_load(f)
-                assert loaded["models"][0]["destination"] == dest
 
-    def test_valid_node_versions(self, temp_dir):
-        """Test various valid node version specifiers"""
-        valid_versions = [
-            "latest",
-            "nightly",
-            "v1.0.5",
-            "v2.47",
-            "abc123def456",
-            "main",
-            "develop",
-            "feature/new-nodes"
-        ]
+class TestConfigYAMLValidation:
+    """Test validation of config.yml contents"""
 
-        for version in valid_versions:
-            config_file = temp_dir / f"config_{version.replace('/', '_')}.yml"
-            config = {
-                "nodes": [
-                    {
-                        "url": "https://github.com/user/repo.git",
-                        "version": version
-                    }
-                ]
-            }
-            config_file.write_text(yaml.dump(config))
+    @pytest.mark.parametrize("dest", [
+        "checkpoints", "vae", "loras", "controlnet", "clip_vision",
+        "embeddings", "upscale_models", "diffusion_models",
+        "text_encoders", "clip", "configs", "sams", "detection",
+        "unet", "style_models", "hypernetworks"
+    ])
+    def test_valid_model_destinations(self, tmp_path, dest):
+        """Test valid model destinations"""
+        config_file = tmp_path / f"config_{dest}.yml"
+        config_file.write_bytes(_model_config_bytes(dest))
 
-            with open(config_file) as f:
-                loaded = yaml.safe_load(f)
-                assert loaded["nodes"][0]["version"] == version
+        with open(config_file) as f:
+            loaded = yaml.load(f, Loader=SafeLoader)
+            assert loaded["models"][0]["destination"] == dest
+
+    @pytest.mark.parametrize("version", [
+        "latest",
+        "nightly",
+        "v1.0.5",
+        "v2.47",
+        "abc123def456",
+        "main",
+        "develop",
+        "feature/new-nodes"
+    ])
+    def test_valid_node_versions(self, tmp_path, version):
+        """Test various valid node version specifiers"""
+        config_file = tmp_path / f"config_{version.replace('/', '_')}.yml"
+        config_file.write_bytes(_node_config_bytes(version))
+
+        with open(config_file) as f:
+            loaded = yaml.load(f, Loader=SafeLoader)
+            assert loaded["nodes"][0]["version"] == version
 
 
 class TestConfigYAMLComments:
@@ -228,7 +247,7 @@ nodes:
 
         # Comments should not affect parsing
         with open(config_file) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         assert len(config["models"]) == 1
         assert len(config["nodes"]) == 1
@@ -249,10 +268,10 @@ class TestConfigYAMLMultipleEntries:
                 for i in range(10)
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=SafeDumper))
 
         with open(config_file) as f:
-            loaded = yaml.safe_load(f)
+            loaded = yaml.load(f, Loader=SafeLoader)
 
         assert len(loaded["models"]) == 10
 
@@ -268,10 +287,10 @@ class TestConfigYAMLMultipleEntries:
                 for i in range(10)
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=SafeDumper))
 
         with open(config_file) as f:
-            loaded = yaml.safe_load(f)
+            loaded = yaml.load(f, Loader=SafeLoader)
 
         assert len(loaded["nodes"]) == 10
 
@@ -300,10 +319,10 @@ class TestConfigYAMLRealWorld:
                 }
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=SafeDumper))
 
         with open(config_file) as f:
-            loaded = yaml.safe_load(f)
+            loaded = yaml.load(f, Loader=SafeLoader)
 
         assert len(loaded["models"]) == 2
         assert len(loaded["nodes"]) == 1
@@ -335,10 +354,10 @@ class TestConfigYAMLRealWorld:
                 }
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=SafeDumper))
 
         with open(config_file) as f:
-            loaded = yaml.safe_load(f)
+            loaded = yaml.load(f, Loader=SafeLoader)
 
         # Verify pinned versions
         for node in loaded["nodes"]:
@@ -1,10 +1,33 @@
 """Tests for download_models.py with config.yml"""
+import os
+import uuid
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
 import tempfile
 import yaml
 
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _parse_in_memory(config):
+    """Run ConfigParser against an in-memory config, no filesystem I/O.
+
+    Uses a unique virtual path per call so the parser's (path, mtime, size)
+    parse cache never collides across tests.
+    """
+    from download_models import ConfigParser
+
+    yaml_text = yaml.dump(config, Dumper=_Dumper)
+    fake_path = Path(f"/virtual/{uuid.uuid4().hex}.yml")
+    fake_stat = os.stat_result((0o100644, 0, 0, 1, 0, 0, len(yaml_text), 0, 0, 0))
+
+    with patch("download_models.os.stat", return_value=fake_stat), \
+            patch("builtins.open", mock_open(read_data=yaml_text)):
+        parser = ConfigParser(fake_path)
+        entries = parser.parse()
+    return parser, entries
+
 
 @pytest.fixture
 def temp_dir():
@@ -13,28 +36,31 @@ def temp_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture
-def sample_config_yml(temp_dir):
-    """Create sample config.yml file for models"""
-    config_file = temp_dir / "config.yml"
-    config = {
-        "models": [
-            {
-                "url": "https://example.com/model1.safetensors",
-                "destination": "checkpoints"
-            },
-            {
-                "url": "https://example.com/model2.safetensors",
-                "destination": "vae",
-                "optional": True
-            },
-            {
-                "url": "https://example.com/model3.ckpt",
-                "destination": "loras"
-            }
-        ]
-    }
-    config_file.write_text(yaml.dump(config))
+# Serialized once: the sample config is read-only in every test that uses it
+_SAMPLE_YAML = yaml.dump({
+    "models": [
+        {
+            "url": "https://example.com/model1.safetensors",
+            "destination": "checkpoints"
+        },
+        {
+            "url": "https://example.com/model2.safetensors",
+            "destination": "vae",
+            "optional": True
+        },
+        {
+            "url": "https://example.com/model3.ckpt",
+            "destination": "loras"
+        }
+    ]
+}, Dumper=_Dumper)
+
+
+@pytest.fixture(scope="session")
+def sample_config_yml(tmp_path_factory):
+    """Create sample config.yml file for models (session-scoped: read-only)"""
+    config_file = tmp_path_factory.mktemp("cfg") / "config.yml"
+    config_file.write_text(_SAMPLE_YAML)
     return config_file
 
 
@@ -63,43 +89,29 @@ class TestConfigParser:
         assert entries[1].is_optional
         assert entries[1].destination == "vae"
 
-    def test_parse_empty_models(self, temp_dir):
-        """Test parsing config.yml with empty models list"""
-        from download_models import ConfigParser
-
-        config_file = temp_dir / "config.yml"
-        config = {"models": []}
-        config_file.write_text(yaml.dump(config))
-
-        parser = ConfigParser(config_file)
-        entries = parser.parse()
+    def test_parse_empty_models(self):
+        """Test parsing config with empty models list"""
+        parser, entries = _parse_in_memory({"models": []})
 
         assert len(entries) == 0
         assert len(parser.errors) == 0
 
-    def test_invalid_destination(self, temp_dir):
+    def test_invalid_destination(self):
         """Test invalid destination error"""
-        from download_models import ConfigParser
-
-        config_file = temp_dir / "config.yml"
-        config = {
+        parser, entries = _parse_in_memory({
             "models": [
                 {
                     "url": "https://example.com/model.safetensors",
                     "destination": "invalid_dest"
                 }
             ]
-        }
-        config_file.write_text(yaml.dump(config))
-
-        parser = ConfigParser(config_file)
-        entries = parser.parse()
+        })
 
         assert len(parser.errors) > 0
         assert "invalid_dest" in parser.errors[0].lower()
 
     def test_missing_required_fields(self, temp_dir):
-        """Test error when required fields are missing"""
+        """Test that entries missing the required destination are skipped with a warning"""
         from download_models import ConfigParser
 
         config_file = temp_dir / "config.yml"
@@ -111,12 +123,13 @@ class TestConfigParser:
                 }
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=_Dumper))
 
         parser = ConfigParser(config_file)
         entries = parser.parse()
 
-        assert len(parser.errors) > 0
+        assert len(entries) == 0
+        assert len(parser.warnings) > 0
 
     def test_file_not_found(self, temp_dir):
         """Test handling of missing config file"""
@@ -142,16 +155,9 @@ class TestConfigParser:
         assert len(entries) == 0
         assert len(parser.errors) > 0
 
-    def test_missing_models_key(self, temp_dir):
+    def test_missing_models_key(self):
         """Test handling of config without models key"""
-        from download_models import ConfigParser
-
-        config_file = temp_dir / "config.yml"
-        config = {"nodes": []}  # Missing models key
-        config_file.write_text(yaml.dump(config))
-
-        parser = ConfigParser(config_file)
-        entries = parser.parse()
+        parser, entries = _parse_in_memory({"nodes": []})  # Missing models key
 
         assert len(entries) == 0
 
@@ -174,7 +180,7 @@ class TestConfigParser:
                 for i, dest in enumerate(valid_destinations)
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=_Dumper))
 
         parser = ConfigParser(config_file)
         entries = parser.parse()
@@ -202,12 +208,17 @@ class TestModelDownloader:
             filename="model.safetensors"
         )
 
-        # Mock successful download
-        mock_urlretrieve.return_value = ("path", {})
+        # Mock successful download (creates the target file like the real one)
+        def fake_download(url, filename, reporthook=None):
+            Path(filename).write_bytes(b"data")
+            return (filename, {})
 
-        result = downloader.download_entry(entry)
+        mock_urlretrieve.side_effect = fake_download
+
+        success, message = downloader.download_entry(entry)
 
-        assert result is True
+        assert success is True
+        assert "Downloaded" in message
         mock_urlretrieve.assert_called_once()
 
     def test_skip_existing_file(self, temp_dir):
@@ -273,10 +284,11 @@ class TestModelDownloader:
         # Mock failed download
         mock_urlretrieve.side_effect = Exception("Download failed")
 
-        result = downloader.download_entry(entry)
+        success, message = downloader.download_entry(entry)
 
         # Should return True for optional models even on failure
-        assert result is True
+        assert success is True
+        assert "optional" in message
         assert downloader.failed == 0  # Optional failures don't count as failures
 
 
@@ -336,7 +348,11 @@ class TestDownloadModelsIntegration:
         from download_models import main
         import sys
 
-        mock_urlretrieve.return_value = ("path", {})
+        def fake_download(url, filename, reporthook=None):
+            Path(filename).write_bytes(b"data")
+            return (filename, {})
+
+        mock_urlretrieve.side_effect = fake_download
 
         old_argv = sys.argv
 
@@ -379,7 +395,7 @@ class TestRealWorldScenarios:
                 }
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=_Dumper))
 
         parser = ConfigParser(config_file)
         entries = parser.parse()
@@ -407,7 +423,7 @@ class TestRealWorldScenarios:
                 }
             ]
         }
-        config_file.write_text(yaml.dump(config))
+        config_file.write_text(yaml.dump(config, Dumper=_Dumper))
 
         parser = ConfigParser(config_file)
         entries = parser.parse()
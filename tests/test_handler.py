@@ -63,15 +63,15 @@ class TestApplyOverrides:
         # Original should be unchanged
         assert sample_workflow["6"]["inputs"]["text"] == original_text
 
-    def test_nonexistent_node_warning(self, sample_workflow, capsys):
+    def test_nonexistent_node_warning(self, sample_workflow, caplog):
         """Test warning when node doesn't exist"""
         from handler import apply_overrides
 
         overrides = [{"node_id": "999", "field": "inputs.text", "value": "test"}]
-        apply_overrides(sample_workflow, overrides)
+        with caplog.at_level("WARNING", logger="handler"):
+            apply_overrides(sample_workflow, overrides)
 
-        captured = capsys.readouterr()
-        assert "Warning: Node 999 not found" in captured.out
+        assert "Node 999 not found" in caplog.text
 
     def test_nested_field_creation(self, sample_workflow):
         """Test creating nested fields that don't exist"""
@@ -94,7 +94,7 @@ class TestApplyOverrides:
 class TestCheckServer:
     """Tests for check_server function"""
 
-    @patch('handler.requests.get')
+    @patch('handler._SESSION.get')
     def test_server_available(self, mock_get):
         """Test when server is available"""
         from handler import check_server
@@ -106,7 +106,7 @@ class TestCheckServer:
         # Should not raise exception
         check_server(max_retries=1)
 
-    @patch('handler.requests.get')
+    @patch('handler._SESSION.get')
     def test_server_unavailable(self, mock_get):
         """Test when server is unavailable"""
         from handler import check_server
@@ -199,6 +199,7 @@ class TestGetImageUrl:
 class TestHandler:
     """Tests for main handler function"""
 
+    @patch('handler.check_server')
     @patch('handler.queue_prompt')
     @patch('handler.wait_for_completion')
     @patch('handler.get_output_images')
@@ -207,6 +208,7 @@ class TestHandler:
         mock_get_images,
         mock_wait,
         mock_queue,
+        mock_check,
         sample_workflow
     ):
         """Test successful workflow execution"""
@@ -240,10 +242,11 @@ class TestHandler:
 
         assert "error" in result
 
+    @patch('handler.check_server')
     @patch('handler.queue_prompt')
-    def test_timeout_error(self, mock_queue, sample_workflow):
+    def test_timeout_error(self, mock_queue, mock_check, sample_workflow):
         """Test timeout handling"""
-        from handler import handler, TimeoutError
+        from handler import handler
 
         mock_queue.return_value = "test-id"
 
@@ -0,0 +1,48 @@
+"""Tests for the shared YAML section streamer"""
+import pytest
+import yaml
+
+from yaml_stream import stream_parse_section
+
+
+def _write(tmp_path, text):
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(text)
+    return config_file
+
+
+class TestStreamParseSection:
+    """Tests for stream_parse_section"""
+
+    @pytest.mark.parametrize("spelling,expected", [
+        ("true", True), ("True", True), ("yes", True), ("Yes", True), ("on", True),
+        ("false", False), ("False", False), ("no", False), ("No", False), ("off", False),
+    ])
+    def test_yaml11_bool_spellings(self, tmp_path, spelling, expected):
+        """Test that streamed booleans match what SafeLoader resolves"""
+        text = f"models:\n  - url: https://example.com/m.safetensors\n    optional: {spelling}\n"
+        path = _write(tmp_path, text)
+
+        streamed = stream_parse_section(path, "models")
+        full = yaml.safe_load(text)["models"]
+
+        assert streamed[0]["optional"] is expected
+        assert streamed[0]["optional"] == full[0]["optional"]
+
+    def test_missing_section_returns_none(self, tmp_path):
+        """Test that an absent key falls back instead of faking an empty list"""
+        path = _write(tmp_path, "nodes:\n  - url: https://example.com/repo.git\n")
+
+        assert stream_parse_section(path, "models") is None
+
+    def test_empty_section_returns_empty_list(self, tmp_path):
+        """Test that an explicitly empty section streams as an empty list"""
+        path = _write(tmp_path, "models: []\n")
+
+        assert stream_parse_section(path, "models") == []
+
+    def test_scalar_section_returns_none(self, tmp_path):
+        """Test that a non-sequence section defers to the full loader"""
+        path = _write(tmp_path, "models: nope\n")
+
+        assert stream_parse_section(path, "models") is None
@@ -0,0 +1,144 @@
+"""
+Streaming extraction of a single top-level sequence from a YAML document.
+
+download_models.py and install_nodes.py each consume exactly one
+top-level key ('models' / 'nodes') holding a list of small flat maps.
+For large documents, walking parse events and materializing only that
+section avoids building a Python object tree for every sibling section.
+"""
+
+try:
+    import yaml
+    try:
+        # libyaml-backed loader is orders of magnitude faster than pure Python
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+except ImportError:  # PyYAML missing; callers report this before streaming
+    yaml = None
+    _YamlLoader = None
+
+# Above this size, event-parse just the wanted section instead of
+# building Python objects for the whole document
+STREAM_THRESHOLD = 1 << 20
+
+
+# Plain-scalar spellings SafeLoader resolves to bool/null (YAML 1.1)
+_TRUE_VALUES = frozenset(('true', 'True', 'TRUE', 'yes', 'Yes', 'YES', 'on', 'On', 'ON'))
+_FALSE_VALUES = frozenset(('false', 'False', 'FALSE', 'no', 'No', 'NO', 'off', 'Off', 'OFF'))
+_NULL_VALUES = frozenset(('null', 'Null', 'NULL', '~', ''))
+
+
+def _scalar_value(event):
+    """Resolve a plain YAML scalar event to bool/int/float/None/str."""
+    if event.style not in (None, ''):
+        return event.value
+    value = event.value
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    if value in _NULL_VALUES:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def _consume_sequence(events):
+    """Collect the entries of an open sequence from a parse stream."""
+    entries = []
+    for event in events:
+        if isinstance(event, yaml.SequenceEndEvent):
+            return entries
+        if isinstance(event, yaml.ScalarEvent):
+            # Non-dict entry: keep it so the caller's type warning fires
+            entries.append(_scalar_value(event))
+            continue
+        if isinstance(event, yaml.MappingStartEvent):
+            entry = {}
+            key = None
+            is_key = True
+            depth = 1
+            for inner in events:
+                if depth == 1 and isinstance(inner, yaml.ScalarEvent):
+                    if is_key:
+                        key = inner.value
+                        is_key = False
+                    else:
+                        entry[key] = _scalar_value(inner)
+                        is_key = True
+                elif isinstance(inner, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                    depth += 1
+                elif isinstance(inner, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                    depth -= 1
+                    if depth == 0:
+                        break
+                    if depth == 1:
+                        # A nested container was this key's value; drop it
+                        is_key = True
+            entries.append(entry)
+    return entries
+
+
+def stream_parse_section(path, section_key):
+    """
+    Extract only the top-level `section_key` sequence using YAML parse
+    events.
+
+    Skips object construction for sibling sections and stops reading
+    once the wanted sequence closes. Returns None when the key is
+    absent, the document shape is unsupported, or parsing fails, so the
+    caller can fall back to a full yaml.load and emit its own warnings.
+    """
+    if yaml is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            events = yaml.parse(f, Loader=_YamlLoader)
+            in_root = False
+            current_key = None
+            is_key = True
+            for event in events:
+                if not in_root:
+                    if isinstance(event, yaml.MappingStartEvent):
+                        in_root = True
+                    elif isinstance(event, (yaml.DocumentEndEvent, yaml.StreamEndEvent)):
+                        break
+                    continue
+
+                if isinstance(event, yaml.ScalarEvent):
+                    if is_key:
+                        current_key = event.value
+                        is_key = False
+                    else:
+                        if current_key == section_key:
+                            # The section is a scalar, not a list; let the
+                            # full loader produce the proper error
+                            return None
+                        is_key = True
+                elif isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+                    if current_key == section_key and isinstance(event, yaml.SequenceStartEvent):
+                        return _consume_sequence(events)
+                    if current_key == section_key:
+                        return None
+                    # Skip the whole container without building objects
+                    depth = 1
+                    for inner in events:
+                        if isinstance(inner, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+                            depth += 1
+                        elif isinstance(inner, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+                            depth -= 1
+                            if depth == 0:
+                                break
+                    is_key = True
+                elif isinstance(event, yaml.MappingEndEvent):
+                    break
+    except Exception:
+        return None
+    # Key never seen: let the full parse report the missing section
+    return None